@@ -1,161 +1,143 @@
 import os
 import re
 import json
+import hashlib
+import mmap
+import itertools
 from sec_downloader import Downloader
 from sec_downloader.types import RequestedFilings
 #from sec_edgar_downloader import Downloader
 from lxml import etree
-from functools import lru_cache
-import io
-
+from functools import lru_cache, wraps
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Case-insensitive probe for a traditional <XBRL> block or inline ix: tags in raw filing bytes.
+XBRL_MARKER_RE = re.compile(rb'<xbrl|<ix:', re.IGNORECASE)
+
+# One ix:nonFraction fact with a plain-text value, matched directly in the raw filing bytes.
+INLINE_FACT_RE = re.compile(
+    rb'<ix:nonFraction\b[^>]*?\sname=["\'](?P<name>[^"\']+)["\'][^>]*>(?P<value>[^<]*)</ix:nonFraction>'
+)
+
+PARSE_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "fin-summarizer")
+
+INLINE_XBRL_NONFRACTION_TAG = "{http://www.xbrl.org/2013/inlineXBRL}nonFraction"
+
+# Inline XBRL fact name -> (field, rank). For each field the lowest rank seen wins;
+# among facts of equal rank the first one in the document is kept.
+XBRL_FACT_PRIORITY = {
+    "us-gaap:RevenueFromContractWithCustomerExcludingAssessedTax": ("Revenue", 0),
+    "us-gaap:SalesRevenueNet": ("Revenue", 1),
+    "us-gaap:Revenues": ("Revenue", 2),
+    "us-gaap:NetSales": ("Revenue", 3),
+    "us-gaap:NetRevenue": ("Revenue", 4),
+    "us-gaap:CostOfGoodsSold": ("Cost of Goods Sold", 0),
+    "us-gaap:CostOfGoodsAndServicesSold": ("Cost of Goods Sold", 0),
+    "us-gaap:CostOfRevenue": ("Cost of Goods Sold", 1),
+    "us-gaap:OperatingIncomeLoss": ("Operating Income", 0),
+    "us-gaap:OperatingIncome": ("Operating Income", 1),
+    "us-gaap:DepreciationDepletionAndAmortization": ("DepreciationAmortation", 0),
+    "us-gaap:InterestExpense": ("Interest Expense", 0),
+    "us-gaap:InterestExpenseBenefit": ("Interest Expense", 1),
+    "us-gaap:IncomeBeforeTax": ("Income Before Tax", 0),
+    "us-gaap:ProfitBeforeTax": ("Income Before Tax", 0),
+    "us-gaap:PreTaxIncome": ("Income Before Tax", 0),
+    "us-gaap:IncomeBeforeTaxExpenseBenefit": ("Income Before Tax", 1)
+}
+
+# Traditional (non-inline) XBRL instances carry facts as us-gaap elements rather than
+# ix:nonFraction name attributes; map their Clark tags onto the same fact names.
+US_GAAP_NS = "http://fasb.org/us-gaap/2024"
+XBRL_INSTANCE_FACT_TAGS = {
+    f"{{{US_GAAP_NS}}}{name.split(':', 1)[1]}": name for name in XBRL_FACT_PRIORITY
+}
+
+# The fact names XBRL_FACT_PRIORITY ranks, as bytes, so the inline regex scan can discard
+# every other fact before decoding anything.
+INLINE_FACT_NAMES = frozenset(name.encode('ascii') for name in XBRL_FACT_PRIORITY)
+
+# Part of every on-disk parse cache key. Bump it whenever the extraction logic changes, so
+# results written by an older parser are never served for the same filing.
+PARSE_CACHE_VERSION = 1
+
+# BLAKE2b salt for the on-disk cache key, derived from PARSE_CACHE_VERSION and the extraction
+# tables, so edits to the fact priorities or the inline fact pattern invalidate old entries
+# even without a version bump.
+PARSE_CACHE_SALT = hashlib.blake2b(
+    repr((PARSE_CACHE_VERSION, INLINE_FACT_RE.pattern, sorted(XBRL_FACT_PRIORITY.items()), US_GAAP_NS)).encode(),
+    digest_size=16
+).digest()
+
+@lru_cache(maxsize=4096)
 def try_convert_to_float(value_str):
+    if not value_str:
+        return None
+    if ',' in value_str:
+        value_str = value_str.replace(',', '')
+    value_str = value_str.strip()
+    if not value_str:
+        return None
     try:
-        return float(value_str.replace(',', '').strip())
-    except Exception:
+        return float(value_str)
+    except ValueError:
         return None
 
-@lru_cache(maxsize=10)
-def xbrl_parse_financial_data(file_path):
+def fast_iter(context):
     """
-    Non-iterparse version using fromstring.
-    Wraps the extracted XBRL block in a dummy root to ensure well-formed XML.
-    Removes any XML declarations before parsing.
+    Yields each element from an iterparse context, then clears it and deletes
+    the already-processed siblings of it and of every ancestor, so the partial
+    tree lxml keeps in memory never grows beyond the current path.
     """
-    xbrl_lines = []
-    inside_xbrl = False
-    with open(file_path, 'r', encoding='utf8', errors='ignore') as f:
-        for line in f:
-            if '<XBRL' in line:
-                inside_xbrl = True
-            if inside_xbrl:
-                xbrl_lines.append(line)
-            if '</XBRL>' in line and inside_xbrl:
-                break
-
-    if xbrl_lines:
-        xbrl_content = ''.join(xbrl_lines)
-    else:
-        with open(file_path, 'r', encoding='utf8', errors='ignore') as f:
-            xbrl_content = f.read()
-
-    xbrl_content = xbrl_content.strip()
-    # Remove any XML declarations.
-    xbrl_content = re.sub(r'<\?xml[^>]+\?>', '', xbrl_content).strip()
-    # Wrap in a dummy root.
-    wrapped_content = f"<root>{xbrl_content}</root>"
-    
-    try:
-        tree = etree.fromstring(wrapped_content.encode('utf8'))
-    except Exception as e:
-        print("Error parsing XBRL XML in non-iterparse version:", e)
-        return {
-            'Revenue': None,
-            'Cost of Goods Sold': None,
-            'Operating Income': None,
-            'Depreciation': None,
-            'Amortization': None,
-            'Interest Expense': None,
-            'Income Before Tax': None
-        }
-
-    ns = {'us-gaap': 'http://fasb.org/us-gaap/2024'}
-
-    # Try several alternatives for Revenue.
-    revenue = tree.xpath('string(//us-gaap:RevenueFromContractWithCustomerExcludingAssessedTax)', namespaces=ns)
-    if revenue.strip() == "":
-        revenue = tree.xpath('string(//us-gaap:SalesRevenueNet)', namespaces=ns)
-    if revenue.strip() == "":
-        revenue = tree.xpath('string(//us-gaap:Revenues)', namespaces=ns)
-    if revenue.strip() == "":
-        revenue = tree.xpath('string(//us-gaap:NetSales)', namespaces=ns)
-    if revenue.strip() == "":
-        revenue = tree.xpath('string(//us-gaap:NetRevenue)', namespaces=ns)
-
-    cogs = tree.xpath('string(//us-gaap:CostOfGoodsSold)', namespaces=ns)
-    if cogs.strip() == "":
-        cogs = tree.xpath('string(//us-gaap:CostOfRevenue)', namespaces=ns)
-
-    operating_income = tree.xpath('string(//us-gaap:OperatingIncomeLoss)', namespaces=ns)
-    if operating_income.strip() == "":
-        operating_income = tree.xpath('string(//us-gaap:OperatingIncome)', namespaces=ns)
-
-    dep_amort = tree.xpath('string(//us-gaap:DepreciationDepletionAndAmortization)', namespaces=ns)
-    depreciation = None
-    amortization = None
-    if dep_amort.strip() != "":
-        combined = try_convert_to_float(dep_amort)
-        if combined is not None:
-            depreciation = combined / 2
-            amortization = combined / 2
-
-    interest_expense = tree.xpath('string(//us-gaap:InterestExpense)', namespaces=ns)
-    if interest_expense.strip() == "":
-        interest_expense = tree.xpath('string(//us-gaap:InterestExpenseBenefit)', namespaces=ns)
-
-    income_before_tax = tree.xpath('string(//us-gaap:IncomeBeforeTax)', namespaces=ns)
-    if income_before_tax.strip() == "":
-        income_before_tax = tree.xpath('string(//us-gaap:IncomeBeforeTaxExpenseBenefit)', namespaces=ns)
-
-    data = {
-        'Revenue': try_convert_to_float(revenue),
-        'Cost of Goods Sold': try_convert_to_float(cogs),
-        'Operating Income': try_convert_to_float(operating_income),
-        'Depreciation': depreciation,
-        'Amortization': amortization,
-        'Interest Expense': try_convert_to_float(interest_expense),
-        'Income Before Tax': try_convert_to_float(income_before_tax)
-    }
-    return data
+    for event, elem in context:
+        yield elem
+        elem.clear()
+        node = elem
+        parent = node.getparent()
+        while parent is not None:
+            while node.getprevious() is not None:
+                del parent[0]
+            node = parent
+            parent = node.getparent()
+    del context
+
+def scan_inline_facts(f):
+    """
+    Yields (fact name, text) pairs for the ix:nonFraction facts in an open binary file that
+    XBRL_FACT_PRIORITY ranks, in document order, found with one compiled regex over a memory
+    map of the file. Other facts are skipped before decoding, and facts whose value contains
+    nested markup are not matched. The map stays open until the generator is exhausted or closed.
+    """
+    if os.fstat(f.fileno()).st_size == 0:
+        return
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for m in INLINE_FACT_RE.finditer(mm):
+            name = m.group('name')
+            if name in INLINE_FACT_NAMES:
+                yield name.decode('ascii'), m.group('value').decode('utf8', 'ignore')
 
-@lru_cache(maxsize=10)
-def xbrl_parse_financial_data_iterparse(file_path):
+def iterparse_facts(f):
     """
-    Optimized version using iterparse to stream through inline XBRL data.
-    Wraps the extracted block in a dummy <root> element and removes XML declarations.
+    Yields (fact name, text) pairs from a tag-filtered iterparse over an open binary file,
+    covering both ix:nonFraction facts and traditional us-gaap instance elements.
+    """
+    context = etree.iterparse(
+        f, events=('end',), tag=(INLINE_XBRL_NONFRACTION_TAG, *XBRL_INSTANCE_FACT_TAGS),
+        huge_tree=True, recover=True, collect_ids=False, remove_blank_text=True,
+        remove_comments=True, remove_pis=True, resolve_entities=False, no_network=True
+    )
+    for elem in fast_iter(context):
+        if elem.tag == INLINE_XBRL_NONFRACTION_TAG:
+            name = elem.attrib.get("name", "")
+        else:
+            name = XBRL_INSTANCE_FACT_TAGS[elem.tag]
+        yield name, elem.text or ""
+
+def select_financial_facts(facts):
+    """
+    Applies XBRL_FACT_PRIORITY to (fact name, text) pairs in document order and returns the
+    best-ranked value found for each field. Stops consuming facts once every field holds a
+    rank 0 value, since nothing later in the document can replace it.
     """
-    xbrl_lines = []
-    inside_xbrl = False
-    with open(file_path, 'r', encoding='utf8', errors='ignore') as f:
-        for line in f:
-            if '<XBRL' in line:
-                inside_xbrl = True
-            if inside_xbrl:
-                xbrl_lines.append(line)
-            if '</XBRL>' in line and inside_xbrl:
-                break
-    if xbrl_lines:
-        xbrl_content = ''.join(xbrl_lines)
-    else:
-        with open(file_path, 'r', encoding='utf8', errors='ignore') as f:
-            xbrl_content = f.read()
-
-    xbrl_content = xbrl_content.strip()
-    pattern = re.compile(r'(?s)<XBRL.*?</XBRL>')
-    m = pattern.search(xbrl_content)
-    if m:
-        xbrl_content = m.group(0)
-    xbrl_content = re.sub(r'<\?xml[^>]+\?>', '', xbrl_content).strip()
-    wrapped_content = f"<root>{xbrl_content}</root>"
-    stream = io.BytesIO(wrapped_content.encode('utf8'))
-    
-    target_names = {
-        "us-gaap:SalesRevenueNet": "Revenue",
-        "us-gaap:Revenues": "Revenue",
-        "us-gaap:NetSales": "Revenue",
-        "us-gaap:NetRevenue": "Revenue",
-        "us-gaap:CostOfGoodsSold": "Cost of Goods Sold",
-        "us-gaap:CostOfGoodsAndServicesSold": "Cost of Goods Sold",
-        "us-gaap:CostOfRevenue": "Cost of Goods Sold",
-        "us-gaap:OperatingIncomeLoss": "Operating Income",
-        "us-gaap:OperatingIncome": "Operating Income",
-        "us-gaap:DepreciationDepletionAndAmortization": "DepreciationAmortation",
-        "us-gaap:InterestExpense": "Interest Expense",
-        "us-gaap:InterestExpenseBenefit": "Interest Expense",
-        "us-gaap:IncomeBeforeTax": "Income Before Tax",
-        "us-gaap:IncomeBeforeTaxExpenseBenefit": "Income Before Tax",
-        "us-gaap:ProfitBeforeTax": "Income Before Tax",
-        "us-gaap:PreTaxIncome": "Income Before Tax"
-    }
     data = {
         "Revenue": None,
         "Cost of Goods Sold": None,
@@ -164,35 +146,110 @@ def xbrl_parse_financial_data_iterparse(file_path):
         "Interest Expense": None,
         "Income Before Tax": None
     }
-    inline_ns = "http://www.xbrl.org/2013/inlineXBRL"
+    ranks = {}
+    settled = 0
+    for name, text in facts:
+        entry = XBRL_FACT_PRIORITY.get(name)
+        if entry is not None:
+            key, rank = entry
+            if key not in ranks or rank < ranks[key]:
+                value = try_convert_to_float(text)
+                if value is not None:
+                    data[key] = value
+                    ranks[key] = rank
+                    if rank == 0:
+                        settled += 1
+                        if settled == len(data):
+                            break
+    return data
+
+def parse_cache_path(file_path):
+    """
+    Returns the on-disk cache location for a filing's parsed data. Entries are keyed on a
+    BLAKE2b digest of the filing's bytes salted with PARSE_CACHE_SALT, so they survive
+    re-downloads of identical content but are not served once the content, the extraction
+    tables or PARSE_CACHE_VERSION change. Other parser changes need a version bump.
+    """
+    digest = hashlib.blake2b(digest_size=16, salt=PARSE_CACHE_SALT)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return os.path.join(PARSE_CACHE_DIR, f"{digest.hexdigest()}.json")
+
+def load_cached_parse(cache_path):
+    """
+    Returns the previously parsed data stored at cache_path, or None on a cache miss.
+    """
     try:
-        for event, elem in etree.iterparse(stream, events=('end',)):
-            if elem.tag == f"{{{inline_ns}}}nonFraction":
-                name = elem.attrib.get("name", "")
-                if name in target_names:
-                    key = target_names[name]
-                    text = elem.text or ""
-                    value = try_convert_to_float(text)
-                    if value is not None:
-                        if key == "Revenue":
-                            if data["Revenue"] is None or name == "us-gaap:SalesRevenueNet":
-                                data["Revenue"] = value
-                        elif key == "Cost of Goods Sold":
-                            if data["Cost of Goods Sold"] is None or name in ("us-gaap:CostOfGoodsSold", "us-gaap:CostOfGoodsAndServicesSold"):
-                                data["Cost of Goods Sold"] = value
-                        elif key == "Operating Income":
-                            if data["Operating Income"] is None or name == "us-gaap:OperatingIncomeLoss":
-                                data["Operating Income"] = value
-                        elif key == "DepreciationAmortation":
-                            if data["DepreciationAmortation"] is None:
-                                data["DepreciationAmortation"] = value
-                        elif key == "Interest Expense":
-                            if data["Interest Expense"] is None or name == "us-gaap:InterestExpense":
-                                data["Interest Expense"] = value
-                        elif key == "Income Before Tax":
-                            if data["Income Before Tax"] is None or name in ("us-gaap:IncomeBeforeTax", "us-gaap:ProfitBeforeTax", "us-gaap:PreTaxIncome"):
-                                data["Income Before Tax"] = value
-            elem.clear()
+        with open(cache_path, "r") as jsonfile:
+            return json.load(jsonfile)
+    except (OSError, ValueError):
+        return None
+
+def store_cached_parse(cache_path, data):
+    """
+    Persists parsed data at cache_path so later runs can skip the XML parse.
+    """
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, "w") as jsonfile:
+            json.dump(data, jsonfile)
+    except OSError as e:
+        print("Could not write parse cache:", e)
+
+def disk_cached(func):
+    """
+    Decorator that persists the result of func(file_path, ...) in the on-disk parse cache
+    and serves it from there on later runs. The filing is hashed once per call, and the
+    resulting cache path is used for both the lookup and the store. Empty results (failed
+    parses) are not stored.
+    """
+    @wraps(func)
+    def wrapper(file_path, *args):
+        cache_path = parse_cache_path(file_path)
+        cached = load_cached_parse(cache_path)
+        if cached is not None:
+            return cached
+        result = func(file_path, *args)
+        if result:
+            store_cached_parse(cache_path, result)
+        return result
+    return wrapper
+
+def xbrl_parse_financial_data_iterparse(file_path):
+    """
+    Extracts the financial data fields from a filing in a single pass.
+    Inline XBRL facts are read with a compiled regex over a memory map of the file;
+    otherwise (e.g. a traditional instance document) the file is streamed through a
+    recover-mode lxml iterparse, which tolerates the EDGAR SGML wrapper.
+    Results are also persisted to disk, so re-running on the same filing skips the parse.
+    """
+    # Resolve the path so relative, absolute and symlinked spellings share one cache entry.
+    file_path = os.path.realpath(file_path)
+    st = os.stat(file_path)
+    return xbrl_parse_financial_data_cached(file_path, st.st_mtime_ns, st.st_size)
+
+@lru_cache(maxsize=256)
+@disk_cached
+def xbrl_parse_financial_data_cached(file_path, mtime_ns, size):
+    """
+    Memoized worker behind xbrl_parse_financial_data_iterparse. mtime_ns and size only
+    take part in the cache key, so a re-downloaded filing is parsed again, not served stale.
+    """
+    try:
+        # Fast path: a single compiled regex over the memory-mapped filing, consumed lazily so
+        # select_financial_facts can stop early. Only documents where it finds no ranked inline
+        # facts at all (e.g. traditional instances) go through lxml.
+        with open(file_path, 'rb') as f:
+            facts = scan_inline_facts(f)
+            try:
+                first = next(facts, None)
+                if first is not None:
+                    data = select_financial_facts(itertools.chain((first,), facts))
+                else:
+                    data = select_financial_facts(iterparse_facts(f))
+            finally:
+                facts.close()
     except Exception as e:
         print("Error during iterparse:", e)
         return {}
@@ -224,7 +281,6 @@ def calculate_financial_ratios(data):
     """
     Computes a set of financial ratios indicative of financial health.
     """
-    ratios = {}
     revenue = data.get("Revenue")
     cogs = data.get("Cost of Goods Sold")
     op_income = data.get("Operating Income")
@@ -233,42 +289,44 @@ def calculate_financial_ratios(data):
     interest_expense = data.get("Interest Expense")
     income_before_tax = data.get("Income Before Tax")
     
+    ratios = {
+        "Gross Profit": None,
+        "Gross Margin": None,
+        "Operating Margin": None,
+        "EBITDA": None,
+        "EBITDA Margin": None,
+        "Effective Tax Rate": None,
+        "Interest Coverage Ratio": None
+    }
+    # Every margin divides by revenue, so check for a usable (non-zero) revenue once.
+    has_revenue = bool(revenue)
+
     # Gross Profit and Gross Margin
     if revenue is not None and cogs is not None:
         gross_profit = revenue - cogs
         ratios["Gross Profit"] = gross_profit
-        ratios["Gross Margin"] = gross_profit / revenue if revenue != 0 else None
-    else:
-        ratios["Gross Profit"] = None
-        ratios["Gross Margin"] = None
+        if has_revenue:
+            ratios["Gross Margin"] = gross_profit / revenue
 
     # Operating Margin
-    if revenue is not None and op_income is not None:
-        ratios["Operating Margin"] = op_income / revenue if revenue != 0 else None
-    else:
-        ratios["Operating Margin"] = None
+    if has_revenue and op_income is not None:
+        ratios["Operating Margin"] = op_income / revenue
 
     # EBITDA and EBITDA Margin
     if op_income is not None and depreciation is not None and amortization is not None:
         EBITDA = op_income + depreciation + amortization
         ratios["EBITDA"] = EBITDA
-        ratios["EBITDA Margin"] = EBITDA / revenue if revenue and revenue != 0 else None
-    else:
-        ratios["EBITDA"] = None
-        ratios["EBITDA Margin"] = None
+        if has_revenue:
+            ratios["EBITDA Margin"] = EBITDA / revenue
 
     # Effective Tax Rate
-    if income_before_tax is not None and op_income is not None:
+    if income_before_tax and op_income is not None:
         tax_expense = income_before_tax - op_income
-        ratios["Effective Tax Rate"] = tax_expense / income_before_tax if income_before_tax != 0 else None
-    else:
-        ratios["Effective Tax Rate"] = None
+        ratios["Effective Tax Rate"] = tax_expense / income_before_tax
 
     # Interest Coverage Ratio
-    if op_income is not None and interest_expense is not None and interest_expense != 0:
+    if op_income is not None and interest_expense:
         ratios["Interest Coverage Ratio"] = op_income / interest_expense
-    else:
-        ratios["Interest Coverage Ratio"] = None
 
     return ratios
 
@@ -371,63 +429,61 @@ def main():
 
     dl = Downloader(credentials["username"], credentials["company"])
 
-    metadatas = dl.get_filing_metadatas(
+    metadatas = list(dl.get_filing_metadatas(
         RequestedFilings(ticker_or_cik=TICKER, form_type=FILING_TYPE, limit=AMOUNT_OF_FILINGS)
-    )
+    ))
 
     base_dir = os.path.join(os.getcwd(), "sec-edgar-filings", TICKER, FILING_TYPE)
     os.makedirs(base_dir, exist_ok=True)
 
     historical_ratios = []
-
-    for metadata in metadatas:
-        accession = metadata.accession_number
-        local_filename = os.path.join(base_dir, f"{accession}.txt")
-
-        content_bytes = dl.download_filing(url=metadata.primary_doc_url)
-        content_str = content_bytes.decode("utf-8", errors="ignore")
-
-        with open(local_filename, "w", encoding="utf-8") as f:
-            f.write(content_str)
-
-        # Skip files that do not appear to contain XBRL.
-        if "<xbrl" not in content_str.lower() and "<ix:" not in content_str.lower():
-            print(f"File {accession} does not appear to be an XBRL file. Skipping.")
-            continue
-
-        try:
-            data = xbrl_parse_financial_data_iterparse(local_filename)
-        except Exception as e:
-            print(f"Error parsing filing {accession}: {e}")
-            continue
-
-        alt_data = xbrl_parse_financial_data(local_filename)
-        if alt_data.get("Revenue") is not None:
-            data["Revenue"] = alt_data.get("Revenue")
-        ratios = calculate_financial_ratios(data)
-        historical_ratios.append(ratios)
-
-        print("Extracted Data:")
-        for key, value in data.items():
-            print(f"  {key}: {value}")
-        print("Calculated Ratios:")
-        for key, value in ratios.items():
-            print(f"  {key}: {value}")
-        print("-" * 40)
-
-        ratios = calculate_financial_ratios(data)
-        historical_ratios.append(ratios)
+    filings = []
+
+    # Downloads are network-bound, so fetch them on a few threads; the pool is kept
+    # small to stay well within SEC EDGAR's fair-access request rate.
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        payloads = executor.map(lambda metadata: dl.download_filing(url=metadata.primary_doc_url), metadatas)
+        for metadata, content_bytes in zip(metadatas, payloads):
+            accession = metadata.accession_number
+            local_filename = os.path.join(base_dir, f"{accession}.txt")
+
+            with open(local_filename, "wb") as f:
+                f.write(content_bytes)
+
+            # Skip files that do not appear to contain XBRL.
+            if not XBRL_MARKER_RE.search(content_bytes):
+                print(f"File {accession} does not appear to be an XBRL file. Skipping.")
+                continue
+
+            filings.append((accession, local_filename))
+
+    # Parsing is CPU-bound inside lxml, so spread the filings over worker processes.
+    # Each worker has its own lru_cache; the on-disk parse cache is shared between them.
+    if filings:
+        with ProcessPoolExecutor(max_workers=min(len(filings), os.cpu_count() or 1)) as executor:
+            futures = [executor.submit(xbrl_parse_financial_data_iterparse, path) for _, path in filings]
+            for (accession, local_filename), future in zip(filings, futures):
+                try:
+                    data = future.result()
+                except Exception as e:
+                    print(f"Error parsing filing {accession}: {e}")
+                    continue
+
+                ratios = calculate_financial_ratios(data)
+                historical_ratios.append(ratios)
+
+                print("Extracted Data:")
+                for key, value in data.items():
+                    print(f"  {key}: {value}")
+                print("Calculated Ratios:")
+                for key, value in ratios.items():
+                    print(f"  {key}: {value}")
+                print("-" * 40)
 
     if not historical_ratios:
         print("No valid XBRL data extracted.")
         return
 
-    # filing_folders = [folder for folder in os.listdir(base_dir) if os.path.isdir(os.path.join(base_dir, folder))]
-    # if not filing_folders:
-    #     print("No filings found.")
-    #     return
-
-
     # Use the latest filing for the composite score.
     latest_ratios = historical_ratios[-1]
     composite_score, ratio_scores = compute_composite_health_score(latest_ratios)
@@ -1,37 +1,65 @@
 import re
-from bs4 import BeautifulSoup
+import io
 import os
 import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from sec_downloader import Downloader
 from sec_downloader.types import RequestedFilings
 #from sec_edgar_downloader import Downloader
+from lxml import etree
 
-def extract_revenue(text):
-    # Define regex patterns for revenue
-    revenue_patterns = [
-        r'Total revenue[^\d]*(\d{1,3}(?:,\d{3})*(?:\.\d+)?)',
-        r'Net sales[^\d]*(\d{1,3}(?:,\d{3})*(?:\.\d+)?)',
-        r'Total net revenue[^\d]*(\d{1,3}(?:,\d{3})*(?:\.\d+)?)'
-    ]
-    
-    for pattern in revenue_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return float(match.group(1).replace(',', ''))
-    
-    # If regex fails, try parsing HTML
-    soup = BeautifulSoup(text, 'html.parser')
-    revenue_tags = soup.find_all(string=re.compile('revenue|sales', re.IGNORECASE))
+# Revenue labels followed by a figure, as one alternation so the text is scanned once.
+REVENUE_RE = re.compile(
+    rb'(?:Total revenue|Net sales|Total net revenue)[^\d]*(\d{1,3}(?:,\d{3})*(?:\.\d+)?)',
+    re.IGNORECASE
+)
+REVENUE_LABEL_RE = re.compile('revenue|sales', re.IGNORECASE)
+CELL_TEXT_XPATH = etree.XPath('text()')
+
+def prune_preceding(elem):
+    """
+    Deletes the already-processed siblings of elem and of every ancestor from the partial tree.
+    """
+    node = elem
+    parent = node.getparent()
+    while parent is not None:
+        while node.getprevious() is not None:
+            del parent[0]
+        node = parent
+        parent = node.getparent()
+
+def extract_revenue(file_path):
+    """
+    Returns the revenue figure from a downloaded filing, or None if none is found. The file
+    is read as bytes, so neither the regex scan nor the HTML fallback needs a decoded copy.
+    """
+    with open(file_path, 'rb') as f:
+        content = f.read()
+
+    match = REVENUE_RE.search(content)
+    if match:
+        return float(match.group(1).replace(b',', b''))
     
-    for tag in revenue_tags:
-        parent = tag.parent
-        if parent.name in ['td', 'th']:
-            next_sibling = parent.find_next_sibling()
-            if next_sibling:
-                try:
-                    return float(next_sibling.text.strip().replace(',', ''))
-                except ValueError:
-                    continue
+    # If regex fails, stream table rows and read the cell after a revenue/sales label cell.
+    context = etree.iterparse(
+        io.BytesIO(content), events=('end',), tag='tr', html=True, encoding='utf-8'
+    )
+    try:
+        for event, row in context:
+            for cell in row.iterchildren('td', 'th'):
+                if any(REVENUE_LABEL_RE.search(s) for s in CELL_TEXT_XPATH(cell)):
+                    next_cell = next(cell.itersiblings(tag=etree.Element), None)
+                    if next_cell is not None:
+                        try:
+                            return float(''.join(next_cell.itertext()).strip().replace(',', ''))
+                        except ValueError:
+                            continue
+            row.clear()
+            # Rows nested in an outer row's cell wait until that outer row is examined.
+            if next(row.iterancestors('tr'), None) is None:
+                prune_preceding(row)
+    except etree.LxmlError:
+        pass
     
     return None
 
@@ -48,33 +76,40 @@ def main():
 
     dl = Downloader(credentials["username"], credentials["company"])
 
-    metadatas = dl.get_filing_metadatas(
+    metadatas = list(dl.get_filing_metadatas(
         RequestedFilings(ticker_or_cik=TICKER, form_type=FILING_TYPE, limit=AMOUNT_OF_FILINGS)
-    )
+    ))
 
     base_dir = os.path.join(os.getcwd(), "sec-edgar-filings", TICKER, FILING_TYPE)
     os.makedirs(base_dir, exist_ok=True)
 
-    for metadata in metadatas:
-        accession = metadata.accession_number
-        local_filename = os.path.join(base_dir, f"{accession}.txt")
+    filings = []
 
-        content_bytes = dl.download_filing(url=metadata.primary_doc_url)
-        content_str = content_bytes.decode("utf-8", errors="ignore")
+    # Fetch every filing up front so the extraction workers below only ever read local
+    # files. Four threads overlap the network waits without hammering EDGAR.
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        payloads = executor.map(lambda metadata: dl.download_filing(url=metadata.primary_doc_url), metadatas)
+        for metadata, content_bytes in zip(metadatas, payloads):
+            accession = metadata.accession_number
+            local_filename = os.path.join(base_dir, f"{accession}.txt")
 
-        with open(local_filename, "w", encoding="utf-8") as f:
-            f.write(content_str)
+            with open(local_filename, "wb") as f:
+                f.write(content_bytes)
 
-        try:
-            revenue = extract_revenue(content_str)
-            print(f"Revenue: {revenue}")
-        except Exception as e:
-            print(f"Error parsing filing {accession}: {e}")
-            continue
+            filings.append((accession, local_filename))
 
-    # Assuming 'text' contains your 10-K filing content
-    # revenue = extract_revenue(text)
-    # print(f"Revenue: {revenue}")
+    # Each worker gets a path rather than the filing text, so nothing large is pickled
+    # across the process boundary; revenues are printed in filing order.
+    if filings:
+        with ProcessPoolExecutor(max_workers=min(len(filings), os.cpu_count() or 1)) as executor:
+            futures = [executor.submit(extract_revenue, path) for _, path in filings]
+            for (accession, _), future in zip(filings, futures):
+                try:
+                    revenue = future.result()
+                    print(f"Revenue: {revenue}")
+                except Exception as e:
+                    print(f"Error parsing filing {accession}: {e}")
+                    continue
 
 if __name__ == "__main__":
     main()
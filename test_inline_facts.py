@@ -0,0 +1,216 @@
+import pytest
+
+import AutoPaperLBO
+from AutoPaperLBO import (
+    XBRL_FACT_PRIORITY, iterparse_facts, scan_inline_facts, select_financial_facts,
+    xbrl_parse_financial_data_iterparse
+)
+
+# A small inline XBRL document covering the attribute layouts the regex has to accept:
+# name before or after other attributes, single or double quotes, thousands separators,
+# surrounding whitespace, and facts that XBRL_FACT_PRIORITY does not rank.
+INLINE_FILING = b"""<?xml version="1.0" encoding="utf-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:ix="http://www.xbrl.org/2013/inlineXBRL">
+<body>
+<table>
+<tr><td>Net sales</td><td><ix:nonFraction name="us-gaap:Revenues" contextRef="FY24" unitRef="usd" decimals="-6">391,035</ix:nonFraction></td></tr>
+<tr><td>Net sales</td><td><ix:nonFraction contextRef="FY24" name="us-gaap:RevenueFromContractWithCustomerExcludingAssessedTax" unitRef="usd">391,035</ix:nonFraction></td></tr>
+<tr><td>Cost of sales</td><td><ix:nonFraction name='us-gaap:CostOfGoodsAndServicesSold' contextRef='FY24'> 210,352 </ix:nonFraction></td></tr>
+<tr><td>Shares</td><td><ix:nonFraction name="us-gaap:WeightedAverageNumberOfSharesOutstandingBasic" contextRef="FY24">15,343,783</ix:nonFraction></td></tr>
+<tr><td>Operating income</td><td><ix:nonFraction name="us-gaap:OperatingIncomeLoss" contextRef="FY24">123,216</ix:nonFraction></td></tr>
+<tr><td>Interest</td><td><ix:nonFraction name="us-gaap:InterestExpense" contextRef="FY24">2,931</ix:nonFraction></td></tr>
+<tr><td>Pre-tax income</td><td><ix:nonFraction name="us-gaap:IncomeBeforeTax" contextRef="FY24">123,485</ix:nonFraction></td></tr>
+<tr><td>Prior year revenue</td><td><ix:nonFraction name="us-gaap:RevenueFromContractWithCustomerExcludingAssessedTax" contextRef="FY23">383,285</ix:nonFraction></td></tr>
+</table>
+</body>
+</html>
+"""
+
+# Lower-ranked facts come first for most fields, so the result only comes out right if
+# later, better-ranked facts override them; equal ranks keep the first fact seen, and a
+# top-ranked fact that does not parse as a number must not block a later one.
+RANKED_FILING = b"""<html xmlns="http://www.w3.org/1999/xhtml" xmlns:ix="http://www.xbrl.org/2013/inlineXBRL">
+<body>
+<ix:nonFraction name="us-gaap:Revenues">900</ix:nonFraction>
+<ix:nonFraction name="us-gaap:SalesRevenueNet">950</ix:nonFraction>
+<ix:nonFraction name="us-gaap:RevenueFromContractWithCustomerExcludingAssessedTax">1,000</ix:nonFraction>
+<ix:nonFraction name="us-gaap:Revenues">800</ix:nonFraction>
+<ix:nonFraction name="us-gaap:CostOfRevenue">700</ix:nonFraction>
+<ix:nonFraction name="us-gaap:CostOfGoodsSold">-</ix:nonFraction>
+<ix:nonFraction name="us-gaap:CostOfGoodsAndServicesSold">600</ix:nonFraction>
+<ix:nonFraction name="us-gaap:OperatingIncomeLoss">200</ix:nonFraction>
+<ix:nonFraction name="us-gaap:OperatingIncome">250</ix:nonFraction>
+<ix:nonFraction name="us-gaap:DepreciationDepletionAndAmortization">40</ix:nonFraction>
+<ix:nonFraction name="us-gaap:InterestExpenseBenefit">15</ix:nonFraction>
+<ix:nonFraction name="us-gaap:InterestExpense">10</ix:nonFraction>
+<ix:nonFraction name="us-gaap:ProfitBeforeTax">190</ix:nonFraction>
+<ix:nonFraction name="us-gaap:IncomeBeforeTax">180</ix:nonFraction>
+</body>
+</html>
+"""
+
+# A traditional XBRL instance: facts are us-gaap elements, so the regex finds nothing and
+# the filing has to go through the lxml fallback. No pre-tax income is reported.
+INSTANCE_FILING = b"""<?xml version="1.0" encoding="utf-8"?>
+<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:us-gaap="http://fasb.org/us-gaap/2024">
+<us-gaap:Revenues contextRef="FY24" unitRef="usd" decimals="-6">1,000</us-gaap:Revenues>
+<us-gaap:RevenueFromContractWithCustomerExcludingAssessedTax contextRef="FY24">1,500</us-gaap:RevenueFromContractWithCustomerExcludingAssessedTax>
+<us-gaap:CostOfGoodsSold contextRef="FY24">600</us-gaap:CostOfGoodsSold>
+<us-gaap:OperatingIncomeLoss contextRef="FY24">200</us-gaap:OperatingIncomeLoss>
+<us-gaap:DepreciationDepletionAndAmortization contextRef="FY24">50</us-gaap:DepreciationDepletionAndAmortization>
+<us-gaap:InterestExpense contextRef="FY24">20</us-gaap:InterestExpense>
+</xbrli:xbrl>
+"""
+
+# Inline XBRL bound to a prefix other than ix:, which the regex does not recognise.
+PREFIXED_FILING = b"""<?xml version="1.0" encoding="utf-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:ixx="http://www.xbrl.org/2013/inlineXBRL">
+<body>
+<ixx:nonFraction name="us-gaap:SalesRevenueNet" contextRef="FY24">2,000</ixx:nonFraction>
+<ixx:nonFraction name="us-gaap:RevenueFromContractWithCustomerExcludingAssessedTax" contextRef="FY24">2,500</ixx:nonFraction>
+<ixx:nonFraction name="us-gaap:CostOfRevenue" contextRef="FY24">1,100</ixx:nonFraction>
+<ixx:nonFraction name="us-gaap:OperatingIncomeLoss" contextRef="FY24">700</ixx:nonFraction>
+<ixx:nonFraction name="us-gaap:IncomeBeforeTax" contextRef="FY24">650</ixx:nonFraction>
+</body>
+</html>
+"""
+
+# Every field's top-ranked fact, followed by lower-ranked facts that can no longer win,
+# once as a traditional instance and once as inline XBRL.
+SETTLED_INSTANCE = b"""<?xml version="1.0" encoding="utf-8"?>
+<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:us-gaap="http://fasb.org/us-gaap/2024">
+<us-gaap:RevenueFromContractWithCustomerExcludingAssessedTax contextRef="FY24">1,500</us-gaap:RevenueFromContractWithCustomerExcludingAssessedTax>
+<us-gaap:CostOfGoodsSold contextRef="FY24">600</us-gaap:CostOfGoodsSold>
+<us-gaap:OperatingIncomeLoss contextRef="FY24">200</us-gaap:OperatingIncomeLoss>
+<us-gaap:DepreciationDepletionAndAmortization contextRef="FY24">50</us-gaap:DepreciationDepletionAndAmortization>
+<us-gaap:InterestExpense contextRef="FY24">20</us-gaap:InterestExpense>
+<us-gaap:IncomeBeforeTax contextRef="FY24">180</us-gaap:IncomeBeforeTax>
+<us-gaap:Revenues contextRef="FY24">1,000</us-gaap:Revenues>
+<us-gaap:CostOfRevenue contextRef="FY24">700</us-gaap:CostOfRevenue>
+<us-gaap:OperatingIncome contextRef="FY24">250</us-gaap:OperatingIncome>
+</xbrli:xbrl>
+"""
+
+SETTLED_INLINE = b"""<html xmlns="http://www.w3.org/1999/xhtml" xmlns:ix="http://www.xbrl.org/2013/inlineXBRL">
+<body>
+<ix:nonFraction name="us-gaap:RevenueFromContractWithCustomerExcludingAssessedTax">1,500</ix:nonFraction>
+<ix:nonFraction name="us-gaap:CostOfGoodsSold">600</ix:nonFraction>
+<ix:nonFraction name="us-gaap:OperatingIncomeLoss">200</ix:nonFraction>
+<ix:nonFraction name="us-gaap:DepreciationDepletionAndAmortization">50</ix:nonFraction>
+<ix:nonFraction name="us-gaap:InterestExpense">20</ix:nonFraction>
+<ix:nonFraction name="us-gaap:IncomeBeforeTax">180</ix:nonFraction>
+<ix:nonFraction name="us-gaap:Revenues">1,000</ix:nonFraction>
+<ix:nonFraction name="us-gaap:CostOfRevenue">700</ix:nonFraction>
+<ix:nonFraction name="us-gaap:OperatingIncome">250</ix:nonFraction>
+</body>
+</html>
+"""
+
+# Only the lower-ranked revenue tags, in reverse priority order.
+FALLBACK_REVENUE_FILING = b"""<html xmlns="http://www.w3.org/1999/xhtml" xmlns:ix="http://www.xbrl.org/2013/inlineXBRL">
+<body>
+<ix:nonFraction name="us-gaap:NetRevenue">300</ix:nonFraction>
+<ix:nonFraction name="us-gaap:NetSales">200</ix:nonFraction>
+<ix:nonFraction name="us-gaap:Revenues">100</ix:nonFraction>
+</body>
+</html>
+"""
+
+@pytest.fixture(autouse=True)
+def parse_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(AutoPaperLBO, "PARSE_CACHE_DIR", str(tmp_path / "cache"))
+
+def write_filing(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+def test_scan_inline_facts_matches_iterparse(tmp_path):
+    path = write_filing(tmp_path, "filing.htm", INLINE_FILING)
+
+    with open(path, 'rb') as f:
+        scanned = list(scan_inline_facts(f))
+    with open(path, 'rb') as f:
+        parsed = [(name, text) for name, text in iterparse_facts(f) if name in XBRL_FACT_PRIORITY]
+
+    assert len(scanned) == 7
+    assert scanned == parsed
+    assert select_financial_facts(scanned) == select_financial_facts(parsed)
+
+def test_better_ranked_facts_override_earlier_ones(tmp_path):
+    path = write_filing(tmp_path, "ranked.htm", RANKED_FILING)
+
+    assert xbrl_parse_financial_data_iterparse(path) == {
+        "Revenue": 1000.0,
+        "Cost of Goods Sold": 600.0,
+        "Operating Income": 200.0,
+        "Depreciation": 20.0,
+        "Amortization": 20.0,
+        "Interest Expense": 10.0,
+        "Income Before Tax": 190.0
+    }
+
+def test_revenue_tags_keep_their_priority_order(tmp_path):
+    path = write_filing(tmp_path, "revenue.htm", FALLBACK_REVENUE_FILING)
+
+    assert xbrl_parse_financial_data_iterparse(path)["Revenue"] == 100.0
+
+def test_traditional_instance_falls_back_to_iterparse(tmp_path):
+    path = write_filing(tmp_path, "instance.xml", INSTANCE_FILING)
+
+    assert xbrl_parse_financial_data_iterparse(path) == {
+        "Revenue": 1500.0,
+        "Cost of Goods Sold": 600.0,
+        "Operating Income": 200.0,
+        "Depreciation": 25.0,
+        "Amortization": 25.0,
+        "Interest Expense": 20.0,
+        "Income Before Tax": 200.0
+    }
+
+def test_non_ix_prefix_falls_back_to_iterparse(tmp_path):
+    path = write_filing(tmp_path, "prefixed.htm", PREFIXED_FILING)
+
+    assert xbrl_parse_financial_data_iterparse(path) == {
+        "Revenue": 2500.0,
+        "Cost of Goods Sold": 1100.0,
+        "Operating Income": 700.0,
+        "Depreciation": None,
+        "Amortization": None,
+        "Interest Expense": None,
+        "Income Before Tax": 650.0
+    }
+
+@pytest.mark.parametrize("source, content", [
+    ("iterparse_facts", SETTLED_INSTANCE),
+    ("scan_inline_facts", SETTLED_INLINE)
+])
+def test_selection_stops_once_every_field_is_settled(tmp_path, monkeypatch, source, content):
+    path = write_filing(tmp_path, "settled.htm", content)
+    facts = getattr(AutoPaperLBO, source)
+    consumed = []
+
+    def recording_facts(f):
+        for name, text in facts(f):
+            consumed.append(name)
+            yield name, text
+
+    monkeypatch.setattr(AutoPaperLBO, source, recording_facts)
+
+    assert xbrl_parse_financial_data_iterparse(path)["Revenue"] == 1500.0
+    assert len(consumed) == 6
+
+def test_cold_parse_hashes_the_filing_once(tmp_path, monkeypatch):
+    path = write_filing(tmp_path, "ranked.htm", RANKED_FILING)
+    hashed = []
+    parse_cache_path = AutoPaperLBO.parse_cache_path
+
+    def recording_parse_cache_path(file_path):
+        hashed.append(file_path)
+        return parse_cache_path(file_path)
+
+    monkeypatch.setattr(AutoPaperLBO, "parse_cache_path", recording_parse_cache_path)
+
+    assert xbrl_parse_financial_data_iterparse(path)["Revenue"] == 1000.0
+    assert len(hashed) == 1
+    assert len(list((tmp_path / "cache").iterdir())) == 1